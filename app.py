@@ -8,12 +8,19 @@ Original file is located at
 """
 
 import dash
-from dash import dcc, html, Input, Output
+import diskcache
+from dash import dcc, html, Input, Output, State, ClientsideFunction, \
+    DiskcacheManager
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
+from flask_caching import Cache
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from loader import load_model_csv
+
 # Load all model CSVs (Assuming all CSVs are in the same folder)
 models_dir = "model_data/"
 
@@ -21,54 +28,142 @@ models_dir = "model_data/"
 if not os.path.exists(models_dir):
     raise FileNotFoundError(f"Directory not found: {models_dir}")
 
-model_files = [f for f in os.listdir(models_dir) if f.endswith(".csv")]
-
-if not model_files:
-    raise ValueError(
-        f"No CSV files found in {models_dir}. Please add your model CSV files to this directory.")
-
-# Dictionary to store all model data
-models_data = {}
-
-# Process each model file with interpolation
-for file in model_files:
-    model_name = file.replace(".csv", "")  # Extract model name
-    df = pd.read_csv(os.path.join(models_dir, file))
-    df["dates"] = pd.to_datetime(df["dates"], format='%m/%d/%y')
-
-    # Sort by date
-    df = df.sort_values("dates")
-
-    # Create continuous date range
-    full_date_range = pd.date_range(
-        start=df["dates"].min(), end=df["dates"].max(), freq="D")
-    df_full = pd.DataFrame({"dates": full_date_range})
-
-    # Merge with full date range and interpolate
-    df_interpolated = pd.merge(df_full, df, on="dates", how="left")
-    if "groundtruth" in df.columns:
-        df_interpolated["groundtruth"] = df_interpolated["groundtruth"].interpolate(
-            method="linear")
-    if "predictions" in df.columns:
-        df_interpolated["predictions"] = df_interpolated["predictions"].interpolate(
-            method="linear")
-    elif "predicted values" in df.columns:
-        df_interpolated["predicted values"] = df_interpolated["predicted values"].interpolate(
-            method="linear")
-
-    models_data[model_name] = df_interpolated
-
-# Get min/max dates and date list for slider
-all_dates = pd.concat([df["dates"] for df in models_data.values()])
-min_date = all_dates.min()
-max_date = all_dates.max()
+def _ingest_models():
+    """Scan the model directory and ingest every CSV.
+
+    Files are fanned out across worker processes; the per-file pandas
+    work is pure compute, so processes (not threads) sidestep the GIL.
+    """
+    model_files = [f for f in os.listdir(models_dir) if f.endswith(".csv")]
+
+    if not model_files:
+        raise ValueError(
+            f"No CSV files found in {models_dir}. Please add your model CSV files to this directory.")
+
+    with ProcessPoolExecutor() as executor:
+        return dict(executor.map(
+            load_model_csv,
+            [os.path.join(models_dir, f) for f in model_files]))
+
+
+models_data = _ingest_models()
+
+# Get min/max dates and date list for slider. Each interpolated frame is
+# already sorted and daily-continuous, so its first/last rows are its
+# bounds - no need to concatenate all date columns just for min/max.
+bounds = [(df["dates"].iat[0], df["dates"].iat[-1])
+          for df in models_data.values()]
+min_date = min(b[0] for b in bounds)
+max_date = max(b[1] for b in bounds)
 date_list = list(pd.date_range(start=min_date, end=max_date, freq="D"))
 
+# Align every model to the shared daily grid and stack the aligned
+# columns once. models_data is immutable after load, so the callback can
+# slice these by slider index instead of boolean-masking a DataFrame.
+# Predictions live in one contiguous float32 (models x days) matrix and
+# ground truth in a single shared vector: row slices stay cache-friendly
+# and there is no per-model object to chase in the hot path.
+full_index = pd.DatetimeIndex(date_list)
+dates_grid = full_index.values.astype("datetime64[D]")
+
+MODEL_META = {}
+GT = np.full(len(date_list), np.nan, dtype=np.float32)
+_pred_rows = []
+for model_name, df in models_data.items():
+    # Some files carry several forecasts per date (multi-horizon output);
+    # average them so the daily index is unique before aligning
+    aligned = df.groupby("dates").mean(numeric_only=True).reindex(full_index)
+    if "predictions" in aligned.columns:
+        pred_col = "predictions"
+    elif "predicted values" in aligned.columns:
+        pred_col = "predicted values"
+    else:
+        pred_col = None
+    # Static per-model facts, hoisted so the callback does no string
+    # munging or column probing per interaction; "row" indexes PRED_MAT
+    MODEL_META[model_name] = {
+        "display_name": model_name.replace(
+            "results-csv_", "").replace("result-csv_", ""),
+        "pred_col": pred_col,
+        "has_gt": "groundtruth" in aligned.columns,
+        "row": len(_pred_rows) if pred_col else None,
+    }
+    if pred_col:
+        _pred_rows.append(aligned[pred_col].to_numpy(np.float32))
+    if "groundtruth" in aligned.columns:
+        # All files describe the same observed series; fill whatever
+        # part of the shared vector this one covers
+        gt = aligned["groundtruth"].to_numpy(np.float32)
+        missing = np.isnan(GT)
+        GT[missing] = gt[missing]
+
+PRED_MAT = (np.stack(_pred_rows) if _pred_rows
+            else np.empty((0, len(date_list)), dtype=np.float32))
+del _pred_rows
+
 # Initialize Dash App
 app = dash.Dash(__name__)
 
 server = app.server
 
+# Shared figure cache. FileSystemCache works across Gunicorn workers,
+# where a per-process lru_cache would not be shared.
+cache = Cache(server, config={
+    "CACHE_TYPE": "FileSystemCache",
+    "CACHE_DIR": "/tmp/dash-cache",
+    "CACHE_DEFAULT_TIMEOUT": 3600,
+})
+
+# Job queue for background callbacks: re-ingestion runs there instead of
+# tying up a web worker for the duration of the parse
+background_callback_manager = DiskcacheManager(
+    diskcache.Cache("./cache/jobs"))
+
+
+def _base_figure():
+    """Figure skeleton with the full static layout.
+
+    Shipped once with the page so the model callback can patch in only
+    the trace list and y-axis range instead of re-sending the layout and
+    forcing a full Plotly.newPlot on every change.
+    """
+    fig = go.Figure()
+    fig.update_layout(
+        title={
+            'text': f"Smooth Time-Series Data from {min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}",
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': dict(size=20)
+        },
+        xaxis_title="Date",
+        yaxis_title="Value",
+        template="plotly_white",
+        hovermode="x",
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=0.01,
+            bgcolor='rgba(255, 255, 255, 0.8)',
+            font=dict(size=12)
+        ),
+        margin=dict(l=50, r=50, t=80, b=50),
+        showlegend=True,
+        plot_bgcolor='white',
+        yaxis=dict(
+            tickmode="linear",
+            dtick=2000  # Y-axis increments by 2000
+        )
+    )
+
+    # Add grid lines for better readability
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
+    return fig
+
+
 # Layout
 app.layout = html.Div([
     html.H1("Time-Series Forecast Dashboard",
@@ -86,6 +181,12 @@ app.layout = html.Div([
                 value=[],  # Default empty
                 inline=False,
                 style={'fontSize': '16px', 'lineHeight': '2'}
+            ),
+            html.Button(
+                "Reload Data",
+                id="reload-data-btn",
+                n_clicks=0,
+                style={'marginTop': '20px'}
             )
         ], style={
             "width": "20%",
@@ -99,6 +200,7 @@ app.layout = html.Div([
         html.Div([
             dcc.Graph(
                 id="time-series-graph",
+                figure=_base_figure(),
                 style={'height': '600px'}
             ),
             html.Div([
@@ -117,125 +219,146 @@ app.layout = html.Div([
                 )
             ], style={'marginTop': '20px', 'padding': '20px'})
         ], style={"width": "75%"})
-    ], style={"display": "flex", "margin": "20px"})
+    ], style={"display": "flex", "margin": "20px"}),
+
+    # Metadata for the clientside figure assembly (index 0 = min_date)
+    dcc.Store(id="date-meta", data={"min_date": min_date.strftime('%Y-%m-%d')}),
+
+    # Trace data for the current model selection; the clientside callback
+    # merges it with the static layout and the slider window
+    dcc.Store(id="traces-store")
 ])
 
 
+# Upper bound on points per rendered trace; wider windows are strided
+# down to roughly this many points before they leave the server
+MAX_POINTS = 2000
+
+
+@cache.memoize()
+def _build_traces(models_key, i0, i1):
+    """Build the trace list and y-range for one (models, date-window) view.
+
+    Memoized on its hashable arguments so repeat visits to the same view
+    are served from the cache instead of being rebuilt, which also works
+    across Gunicorn workers via the shared cache directory. Returns plain
+    trace dicts so the result drops straight into the traces store.
+    """
+    traces = []
+
+    # Cap how many points each trace carries: zoomed out, one pixel
+    # covers many days, so striding the arrays bounds JSON payload and
+    # render cost at ~MAX_POINTS regardless of the date span
+    stride = max(1, (i1 - i0 + 1) // MAX_POINTS)
+
+    # Plot ground truth only once
+    ground_truth_plotted = False
+
+    # Running maximum for the y-axis range; np.nanmax over each sliced
+    # ndarray avoids growing a Python list of every plotted value
+    y_max_raw = 0.0
+    have_values = False
+
+    dates = dates_grid[i0:i1 + 1:stride]
+
+    # Add each selected model's data to the graph
+    for model in models_key:
+        meta = MODEL_META[model]
+
+        # Add ground truth only once
+        if not ground_truth_plotted and meta["has_gt"]:
+            # y-range still scans the unstrided window so the axis does
+            # not shift with zoom level
+            full = GT[i0:i1 + 1]
+            if full.size:
+                y_max_raw = max(y_max_raw, float(np.nanmax(full)))
+                have_values = True
+            traces.append(dict(
+                type="scattergl",
+                x=dates,
+                y=full[::stride],
+                mode="lines",
+                name="Actual Values",
+                line=dict(color='black', width=2)
+            ))
+            ground_truth_plotted = True
+
+        # Add predicted values
+        if meta["pred_col"]:
+            full = PRED_MAT[meta["row"], i0:i1 + 1]
+            if full.size:
+                y_max_raw = max(y_max_raw, float(np.nanmax(full)))
+                have_values = True
+            traces.append(dict(
+                type="scattergl",
+                x=dates,
+                y=full[::stride],
+                mode="lines",
+                name=meta["display_name"],  # Just show the model name
+                line=dict(dash='dash', width=2)
+            ))
+
+    # Calculate y-axis range with fixed increments
+    y_max = (int(y_max_raw // 2000) + 1) * 2000 if have_values else None
+
+    return {"traces": traces, "y_max": y_max, "stride": stride}
+
+
 @app.callback(
-    Output("time-series-graph", "figure"),
-    [Input("model-selection", "value"),
-     Input("date-range-slider", "value")]
+    Output("traces-store", "data"),
+    Input("model-selection", "value")
 )
-def update_graph(selected_models, slider_range):
-    """Update graph dynamically based on selected models and date range."""
-    try:
-        # Create Figure with white background
-        fig = go.Figure()
-
-        # Convert slider indices to dates
-        start_date = date_list[slider_range[0]]
-        end_date = date_list[slider_range[1]]
-
-        # Plot ground truth only once
-        ground_truth_plotted = False
-
-        # Find y-axis range across all selected data
-        all_values = []
-
-        # Add each selected model's data to the graph
-        for model in selected_models:
-            df = models_data[model]
-            df_filtered = df[(df["dates"] >= start_date)
-                             & (df["dates"] <= end_date)]
-
-            # Add ground truth only once
-            if not ground_truth_plotted and "groundtruth" in df_filtered.columns:
-                all_values.extend(df_filtered["groundtruth"].dropna().tolist())
-                fig.add_trace(go.Scatter(
-                    x=df_filtered["dates"],
-                    y=df_filtered["groundtruth"],
-                    mode="lines",
-                    name="Actual Values",
-                    line=dict(color='black', width=2, shape='spline')
-                ))
-                ground_truth_plotted = True
-
-            # Add predicted values - handle both possible column names
-            pred_col = None
-            if "predictions" in df_filtered.columns:
-                pred_col = "predictions"
-            elif "predicted values" in df_filtered.columns:
-                pred_col = "predicted values"
-
-            if pred_col:
-                # Clean up model name for display
-                display_name = model.replace(
-                    "results-csv_", "").replace("result-csv_", "")
-                all_values.extend(df_filtered[pred_col].dropna().tolist())
-                fig.add_trace(go.Scatter(
-                    x=df_filtered["dates"],
-                    y=df_filtered[pred_col],
-                    mode="lines",
-                    name=f"{display_name}",  # Just show the model name
-                    line=dict(dash='dash', width=2, shape='spline')
-                ))
-
-        # Calculate y-axis range with fixed increments
-        if all_values:
-            y_min = 0
-            y_max = ((max(all_values) // 2000) + 1) * 2000
-
-            # Update Layout with Fixed Y-Axis
-            fig.update_layout(
-                title={
-                    'text': f"Smooth Time-Series Data from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
-                    'y': 0.95,
-                    'x': 0.5,
-                    'xanchor': 'center',
-                    'yanchor': 'top',
-                    'font': dict(size=20)
-                },
-                xaxis_title="Date",
-                yaxis_title="Value",
-                template="plotly_white",
-                hovermode="x unified",
-                legend=dict(
-                    yanchor="top",
-                    y=0.99,
-                    xanchor="left",
-                    x=0.01,
-                    bgcolor='rgba(255, 255, 255, 0.8)',
-                    font=dict(size=12)
-                ),
-                margin=dict(l=50, r=50, t=80, b=50),
-                showlegend=True,
-                plot_bgcolor='white',
-                yaxis=dict(
-                    range=[y_min, y_max],
-                    tickmode="linear",
-                    dtick=2000  # Y-axis increments by 2000
-                )
-            )
-
-            # Add grid lines for better readability
-            fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
-            fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGray')
+def update_traces(selected_models):
+    """Rebuild trace data when the model selection changes.
 
-        return fig
+    This is the only work left on the server per interaction; turning the
+    stored traces into a figure and applying the slider window are both
+    clientside, so 99% of slider moves never reach Python.
+    """
+    try:
+        return _build_traces(tuple(sorted(selected_models)),
+                             0, len(date_list) - 1)
 
     except Exception as e:
         print(f"Error occurred: {str(e)}")
-        fig = go.Figure()
-        fig.update_layout(
-            title={
-                'text': f"Error loading data: {str(e)}",
-                'x': 0.5,
-                'xanchor': 'center'
-            }
-        )
-        return fig
+        return {"traces": [], "y_max": None, "error": str(e)}
 
 
+@app.callback(
+    Output("model-selection", "options"),
+    Input("reload-data-btn", "n_clicks"),
+    background=True,
+    manager=background_callback_manager,
+    running=[(Output("reload-data-btn", "disabled"), True, False)],
+    prevent_initial_call=True
+)
+def reload_models(n_clicks):
+    """Re-ingest the model directory without blocking the web workers.
+
+    Runs in the diskcache job queue, so CSV parsing and Parquet cache
+    rewriting happen off the request path. Changed or new files are
+    picked up via the loader's mtime check; the memoized trace cache is
+    dropped because it may reference the old data. Worker processes keep
+    serving their in-memory arrays until they restart, at which point
+    they warm-start from the refreshed Parquet cache.
+    """
+    fresh = _ingest_models()
+    cache.clear()
+    return [{"label": model, "value": model} for model in fresh.keys()]
+
+
+# View assembly is a pure function of (stored traces, slider window) and
+# runs in the browser: no server round-trip or trace re-serialization
+# when the user drags the slider
+app.clientside_callback(
+    ClientsideFunction(namespace="ts", function_name="updateFigure"),
+    Output("time-series-graph", "figure"),
+    Input("traces-store", "data"),
+    Input("date-range-slider", "value"),
+    State("time-series-graph", "figure"),
+    State("date-meta", "data")
+)
+
 # Run App
 if __name__ == "__main__":
     app.run(host='0.0.0.0', port=8050, debug=True)
@@ -0,0 +1,64 @@
+// Clientside handlers for the time-series graph.
+// The server only rebuilds trace data when the model selection changes
+// (traces-store); assembling the figure and applying the slider window
+// both happen here, so slider drags never round-trip to Python.
+// Keep in sync with MAX_POINTS in app.py
+var TS_MAX_POINTS = 2000;
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    ts: {
+        updateFigure: function (storeData, sliderRange, figure, meta) {
+            if (!figure || !figure.layout || !storeData || !meta) {
+                return window.dash_clientside.no_update;
+            }
+            var dayMs = 24 * 60 * 60 * 1000;
+            var t0 = Date.parse(meta.min_date);
+            var iso = function (i) {
+                return new Date(t0 + i * dayMs).toISOString().slice(0, 10);
+            };
+            var layout = Object.assign({}, figure.layout, {
+                xaxis: Object.assign({}, figure.layout.xaxis, {
+                    range: [iso(sliderRange[0]), iso(sliderRange[1])],
+                    autorange: false
+                })
+            });
+            if (storeData.y_max !== null && storeData.y_max !== undefined) {
+                layout.yaxis = Object.assign({}, figure.layout.yaxis, {
+                    range: [0, storeData.y_max]
+                });
+            }
+            if (storeData.error) {
+                layout.title = Object.assign({}, figure.layout.title, {
+                    text: "Error loading data: " + storeData.error
+                });
+            }
+            // Stored arrays cover the full range at the server's stride;
+            // map slider indices to array positions and stride again if
+            // the window still holds more points than worth rendering
+            var s0 = storeData.stride || 1;
+            var a0 = Math.ceil(sliderRange[0] / s0);
+            var a1 = Math.floor(sliderRange[1] / s0);
+            var s1 = Math.max(1, Math.floor((a1 - a0 + 1) / TS_MAX_POINTS));
+            var windowed = function (arr) {
+                if (!arr) {
+                    return arr;
+                }
+                var out = [];
+                for (var k = a0; k <= a1; k += s1) {
+                    out.push(arr[k]);
+                }
+                return out;
+            };
+            var data = (storeData.traces || []).map(function (trace) {
+                return Object.assign({}, trace, {
+                    x: windowed(trace.x),
+                    y: windowed(trace.y)
+                });
+            });
+            return Object.assign({}, figure, {
+                data: data,
+                layout: layout
+            });
+        }
+    }
+});
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Model CSV ingestion helpers.
+
+Kept outside app.py so ProcessPoolExecutor workers can unpickle the
+loader by module name without re-importing the application module,
+which would deadlock on the import lock while app.py is still loading.
+"""
+
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+# Interpolated frames are persisted here after the first load; a warm
+# start then reads Parquet instead of re-parsing CSV text and dates.
+# Bump the version whenever the stored values change meaning, so stale
+# caches from older code are not picked up by the mtime check.
+CACHE_DIR = "cache"
+CACHE_VERSION = 2
+
+VALUE_COLUMNS = ("groundtruth", "predictions", "predicted values")
+
+# Rolling-mean width for the one-time server-side smoothing pass
+SMOOTH_WINDOW = 5
+
+
+def _downcast(df):
+    """Shrink value columns to float32 and dates to second resolution.
+
+    The data is daily with moderate magnitudes, so float64/datetime64[ns]
+    doubles RAM and JSON payload for no extra information. (pandas has no
+    datetime64[D] Series dtype; seconds is its coarsest unit.)
+    """
+    for col in VALUE_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    df["dates"] = df["dates"].astype("datetime64[s]")
+    return df
+
+
+def _parse_model_csv(path):
+    """Single-pass parser for the fixed model-CSV schema.
+
+    The result files always hold float value columns plus a dates column
+    in %m/%d/%y form, so a hand-rolled pass over the raw bytes beats the
+    general-purpose pandas reader: one read, one split per line, and
+    whole-column numpy conversions with no dialect sniffing, type
+    inference or DataFrame block assembly in between.
+    """
+    # Map the file instead of reading through a buffered file object:
+    # pages come straight from the OS cache (no stdio buffer copy), and
+    # a warm re-ingest of an unchanged file touches no disk at all
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        raw = mm[:]
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]  # strip UTF-8 BOM some exports carry
+
+    lines = raw.strip().split(b"\n")
+    header = [name.strip() for name in lines[0].decode().split(",")]
+    rows = [line.rstrip(b"\r").split(b",") for line in lines[1:] if line.strip()]
+
+    columns = {}
+    for name, cells in zip(header, zip(*rows)):
+        if name == "dates":
+            # Rearrange m/d/y into ISO so the whole column converts with
+            # one numpy datetime64 cast (the data is all 20xx)
+            iso = ["20{2}-{0:0>2}-{1:0>2}".format(
+                *cell.decode().strip().split("/")) for cell in cells]
+            columns[name] = np.array(iso, dtype="datetime64[s]")
+        else:
+            columns[name] = np.array(cells, dtype=np.float32)
+    return pd.DataFrame(columns)
+
+
+def load_model_csv(path):
+    """Read, sort and interpolate one model CSV.
+
+    Runs in a worker process so files are ingested in parallel; returns
+    (model_name, interpolated frame). The result is cached as Parquet
+    next to the app, so restarts skip the CSV parse entirely as long as
+    the source file has not changed since the cache was written.
+    """
+    model_name = os.path.basename(path).replace(".csv", "")
+    cache_path = os.path.join(
+        CACHE_DIR, f"{model_name}.v{CACHE_VERSION}.parquet")
+    if (os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(path)):
+        return model_name, _downcast(pd.read_parquet(cache_path))
+
+    df = _parse_model_csv(path)
+
+    # Sort by date and collapse multi-horizon duplicates so the time
+    # axis is strictly increasing (np.interp requires monotonic xp)
+    df = df.sort_values("dates")
+    df = df.groupby("dates", as_index=False).mean(numeric_only=True)
+
+    # Create continuous date range
+    full_date_range = pd.date_range(
+        start=df["dates"].iat[0], end=df["dates"].iat[-1], freq="D")
+
+    # Linear interpolation onto the daily grid via np.interp: one C loop
+    # over integer day offsets, with no merge/hash-join in between
+    t0 = df["dates"].values[0]
+    x_full = (full_date_range.values - t0).astype(
+        "timedelta64[D]").astype(np.int64)
+    x_known = (df["dates"].values - t0).astype(
+        "timedelta64[D]").astype(np.int64)
+
+    columns = {"dates": full_date_range}
+    for col in VALUE_COLUMNS:
+        if col in df.columns:
+            y = df[col].to_numpy(np.float64)
+            known = ~np.isnan(y)
+            columns[col] = np.interp(x_full, x_known[known], y[known])
+
+    df_interpolated = pd.DataFrame(columns)
+
+    # Smooth once here instead of per-render in the browser: the old
+    # line shape='spline' made plotly.js fit curves on every redraw and
+    # is unsupported by Scattergl anyway. A small centered rolling mean
+    # gives the same visual effect for a one-time cost at load.
+    for col in VALUE_COLUMNS:
+        if col in df_interpolated.columns:
+            df_interpolated[col] = df_interpolated[col].rolling(
+                SMOOTH_WINDOW, center=True, min_periods=1).mean()
+
+    df_interpolated = _downcast(df_interpolated)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df_interpolated.to_parquet(cache_path)
+
+    return model_name, df_interpolated